@@ -9,7 +9,8 @@ from services import (
     enhance_prompt,
     generative_fill,
     generate_hd_image,
-    erase_foreground
+    erase_foreground,
+    prewarm
 )
 from PIL import Image
 import io
@@ -40,6 +41,14 @@ print(f"API Key value: {api_key if api_key else 'Not found'}")
 print(f"Current working directory: {os.getcwd()}")
 print(f".env file exists: {os.path.exists('.env')}")
 
+@st.cache_resource
+def warm_up_connection():
+    """Pre-open the TLS connection to the Bria API, once per process."""
+    prewarm()
+    return True
+
+warm_up_connection()
+
 def initialize_session_state():
     """Initialize session state variables."""
     if 'api_key' not in st.session_state:
@@ -1,18 +1,31 @@
-from .lifestyle_shot import lifestyle_shot_by_text, lifestyle_shot_by_image
+from .lifestyle_shot import (
+    lifestyle_shot_by_text,
+    lifestyle_shot_by_text_async,
+    lifestyle_shot_batch,
+    lifestyle_shot_by_image,
+)
 from .shadow import add_shadow
 from .packshot import create_packshot
 from .prompt_enhancement import enhance_prompt
 from .generative_fill import generative_fill
-from .hd_image_generation import generate_hd_image
-from .erase_foreground import erase_foreground
+from .hd_image_generation import generate_hd_image, generate_hd_image_async, generate_hd_image_batch
+from .erase_foreground import erase_foreground, erase_foreground_async
+from ._http import download_result, prewarm
 
 __all__ = [
     'lifestyle_shot_by_text',
+    'lifestyle_shot_by_text_async',
+    'lifestyle_shot_batch',
     'lifestyle_shot_by_image',
     'add_shadow',
     'create_packshot',
     'enhance_prompt',
     'generative_fill',
     'generate_hd_image',
-    'erase_foreground'
-] 
\ No newline at end of file
+    'generate_hd_image_async',
+    'generate_hd_image_batch',
+    'erase_foreground',
+    'erase_foreground_async',
+    'download_result',
+    'prewarm'
+]
@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+import logging
+import threading
+import time
+
+import orjson
+import requests
+
+from ._cache import fetch_with_swr, payload_key, single_flight
+from ._http import (
+    CONNECT_TIMEOUT,
+    MULTIPART_UPLOAD,
+    _mask_key,
+    post_json,
+    post_multipart,
+)
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class BriaConfig:
+    """Per-endpoint tuning for BriaClient.post."""
+    name: str
+    read_timeout: float
+    max_concurrency: int
+    ttl_fresh: float
+    ttl_stale: float
+    connect_timeout: float = CONNECT_TIMEOUT
+
+    def __post_init__(self):
+        # Bulkhead: bounds concurrent calls to this endpoint so a burst
+        # on one service can't starve the others.
+        self.semaphore = threading.BoundedSemaphore(self.max_concurrency)
+
+class BriaClient:
+    """
+    Shared request path for the Bria services.
+
+    One place holds the cross-cutting behavior that used to be copied
+    between service modules: bulkhead semaphores, split connect/read
+    timeouts, the multipart upload flag, response decoding, duration
+    logging, caching and in-flight deduplication.
+    """
+
+    def post(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        *,
+        headers: Dict[str, str],
+        config: BriaConfig,
+        cacheable: bool,
+        image_data: Optional[bytes] = None,
+        error_label: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        POST a payload to a Bria endpoint with the endpoint's tuning.
+
+        Args:
+            url: Full endpoint URL
+            payload: JSON-serializable request body
+            headers: Request headers including the api_token
+            config: Per-endpoint timeouts, concurrency bound and TTLs
+            cacheable: Whether the payload is idempotent enough to cache
+            image_data: Raw image bytes, enabling the multipart path
+            error_label: Prefix for the wrapped failure message
+        """
+        label = error_label or config.name
+        timeout = (config.connect_timeout, config.read_timeout)
+
+        def _post() -> Dict[str, Any]:
+            try:
+                logger.debug(
+                    "%s url=%s api_token=%s",
+                    config.name, url, _mask_key(headers.get('api_token', ''))
+                )
+
+                start = time.monotonic()
+                with config.semaphore:
+                    # Only switch to multipart when the payload actually
+                    # carries the upload: _build_request may have chosen
+                    # image_url over the passed image bytes, and sending
+                    # a file part alongside image_url would change what
+                    # the API sees versus the JSON path.
+                    if MULTIPART_UPLOAD and image_data is not None and 'file' in payload:
+                        fields = {k: v for k, v in payload.items() if k != 'file'}
+                        response = post_multipart(url, headers=headers,
+                                                  image_data=image_data,
+                                                  fields=fields, timeout=timeout)
+                    else:
+                        response = post_json(url, headers=headers,
+                                             payload=payload, timeout=timeout)
+                response.raise_for_status()
+
+                logger.debug(
+                    "%s status=%d duration=%.2fs",
+                    config.name, response.status_code, time.monotonic() - start
+                )
+
+                return orjson.loads(response.content)
+            except requests.exceptions.HTTPError as http_err:
+                # Slice raw bytes rather than using .text: error bodies
+                # can be large and .text runs charset detection on the
+                # whole payload.
+                body = http_err.response.content[:2048]
+                raise Exception(f"{label} failed: {http_err} body={body!r}")
+            except Exception as e:
+                raise Exception(f"{label} failed: {str(e)}")
+
+        # Concurrent duplicates are collapsed onto one in-flight request
+        # even when the payload is not cacheable.
+        key = payload_key(url, payload)
+        if not cacheable:
+            return single_flight(key, _post)
+        return fetch_with_swr(key, config.ttl_fresh, config.ttl_stale, _post)
+
+_CLIENT = BriaClient()
+
+__all__ = ['BriaConfig', 'BriaClient']
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Tuple
+
+from cachetools import TTLCache
+
+# Responses for idempotent payloads are cached so repeat calls within a
+# session skip the round trip (and the billed API call) entirely. The
+# cache ttl is an upper bound on entry lifetime; per-entry freshness is
+# tracked via the stored timestamp so stale entries can still be served
+# while a background revalidation runs (stale-while-revalidate).
+_CACHE = TTLCache(maxsize=256, ttl=2 * 60 * 60)
+_LOCK = threading.Lock()
+_REVALIDATOR = ThreadPoolExecutor(max_workers=2)
+_REVALIDATING = set()
+
+def payload_key(endpoint: str, payload: Dict[str, Any]) -> Tuple[str, str]:
+    """Build a cache key from the endpoint and a hash of the payload."""
+    digest = hashlib.sha256(
+        json.dumps(payload, sort_keys=True).encode('utf-8')
+    ).hexdigest()
+    return (endpoint, digest)
+
+# Requests currently on the wire, keyed like the cache. Streamlit
+# reruns often re-fire a call whose twin is still pending; followers
+# wait on the leader's Future instead of issuing a duplicate API call.
+_INFLIGHT: Dict[Tuple[str, str], Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+def single_flight(key: Tuple[str, str], fn: Callable[[], Any]) -> Any:
+    """
+    Run fn, deduplicating concurrent calls with the same key.
+
+    The first caller (the leader) performs the request; any caller
+    arriving with the same key while it is in flight blocks on the same
+    Future and receives the leader's result or exception.
+    """
+    with _INFLIGHT_LOCK:
+        existing = _INFLIGHT.get(key)
+        if existing is None:
+            future = Future()
+            _INFLIGHT[key] = future
+
+    if existing is not None:
+        return existing.result()
+
+    try:
+        value = fn()
+        future.set_result(value)
+        return value
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+
+def fetch_with_swr(
+    key: Tuple[str, str],
+    ttl_fresh: float,
+    ttl_stale: float,
+    fn: Callable[[], Any]
+) -> Any:
+    """
+    Fetch through the cache with stale-while-revalidate semantics.
+
+    Args:
+        key: Cache key from payload_key
+        ttl_fresh: Seconds during which a cached value is returned as-is
+        ttl_stale: Further seconds during which a cached value is still
+            returned, but a background revalidation is scheduled
+        fn: Zero-argument callable performing the actual request
+    """
+    now = time.monotonic()
+    with _LOCK:
+        entry = _CACHE.get(key)
+
+    if entry is not None:
+        value, fetched_at = entry
+        age = now - fetched_at
+        if age < ttl_fresh:
+            return value
+        if age < ttl_fresh + ttl_stale:
+            _schedule_revalidation(key, fn)
+            return value
+
+    value = single_flight(key, fn)
+    with _LOCK:
+        _CACHE[key] = (value, time.monotonic())
+    return value
+
+def _schedule_revalidation(key: Tuple[str, str], fn: Callable[[], Any]):
+    """Refresh a stale entry in the background, at most once at a time."""
+    with _LOCK:
+        if key in _REVALIDATING:
+            return
+        _REVALIDATING.add(key)
+
+    def _revalidate():
+        try:
+            value = fn()
+            with _LOCK:
+                _CACHE[key] = (value, time.monotonic())
+        except Exception:
+            pass  # keep serving the stale entry until it expires
+        finally:
+            with _LOCK:
+                _REVALIDATING.discard(key)
+
+    _REVALIDATOR.submit(_revalidate)
+
+__all__ = ['payload_key', 'fetch_with_swr', 'single_flight']
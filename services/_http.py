@@ -0,0 +1,318 @@
+import asyncio
+import base64
+import os
+import tempfile
+import threading
+import time
+import weakref
+from functools import lru_cache, wraps
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import httpx
+import orjson
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+# Upload images as binary multipart instead of base64-in-JSON, saving
+# the 33% encoding overhead on the wire. Off by default until the API
+# path is verified against production.
+MULTIPART_UPLOAD = os.environ.get('BRIA_MULTIPART_UPLOAD', '').lower() in ('1', 'true', 'yes')
+
+# Connecting to the Bria API is fast (<500ms typically), so a tight
+# connect timeout fails fast on DNS/TLS issues. Read timeouts are set
+# per endpoint near their p95 since generation times vary widely.
+CONNECT_TIMEOUT = 3.0
+
+# Transient failures (429/5xx, dropped connections) are retried at the
+# connection layer so the retry reuses the pooled connection and honors
+# Retry-After, with jittered exponential backoff between attempts.
+_RETRY = Retry(
+    total=3,
+    backoff_factor=1.5,
+    backoff_jitter=1.0,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=['POST'],
+    respect_retry_after_header=True
+)
+
+class CircuitBreakerError(Exception):
+    """Raised immediately while the circuit breaker is open."""
+
+class _CircuitBreaker:
+    """
+    Circuit breaker whose lock guards only its state bookkeeping.
+
+    pybreaker holds its lock around the entire wrapped call, which would
+    serialize every Bria request process-wide (and starve the
+    single-flight and bulkhead layers of any concurrency). Here the lock
+    is taken briefly before and after the call, so concurrent requests
+    overlap freely.
+
+    Closed: calls pass through; fail_max consecutive failures open the
+    breaker. Open: calls raise CircuitBreakerError immediately. After
+    reset_timeout one probe call is let through (half-open); its success
+    closes the breaker, its failure re-opens it.
+    """
+
+    def __init__(self, fail_max=5, reset_timeout=30, exclude=()):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.exclude = tuple(exclude)
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def _before_call(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            elapsed = time.monotonic() - self._opened_at
+            if elapsed >= self.reset_timeout and not self._probing:
+                # Half-open: let this one call probe the API.
+                self._probing = True
+                return
+            raise CircuitBreakerError("Bria API circuit breaker is open")
+
+    def _record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def _record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._opened_at is not None or self._failures >= self.fail_max:
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            self._before_call()
+            try:
+                result = func(*args, **kwargs)
+            except self.exclude:
+                # Validation errors raised before the request is sent
+                # say nothing about the API's health.
+                raise
+            except Exception:
+                self._record_failure()
+                raise
+            self._record_success()
+            return result
+        return wrapper
+
+# Shared circuit breaker across the Bria services: after 5 consecutive
+# failures calls fail fast with CircuitBreakerError instead of each
+# paying the full timeout-times-retries wait, then a half-open probe
+# after 30s checks whether the API has recovered.
+_BRIA_BREAKER = _CircuitBreaker(
+    fail_max=5,
+    reset_timeout=30,
+    exclude=(ValueError,)
+)
+
+# Shared session so all Bria API calls reuse the same pooled HTTPS
+# connections instead of paying a fresh TCP + TLS handshake per request.
+_SESSION = Session()
+_SESSION.headers.update({
+    'Accept': 'application/json',
+    'Content-Type': 'application/json',
+    # Compressed responses roughly halve bandwidth for the base64-heavy
+    # JSON bodies; requests decodes them transparently.
+    'Accept-Encoding': 'gzip, br'
+})
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=_RETRY
+))
+
+# Async clients for concurrent batches: HTTP/2 multiplexing lets
+# asyncio.gather fire several generations over a handful of connections.
+# A client's keep-alive connections bind to the loop they were opened
+# on, so clients are scoped per event loop; entries die with their loop.
+_LOOP_CLIENTS = weakref.WeakKeyDictionary()
+
+def _async_client() -> httpx.AsyncClient:
+    """Return the shared httpx client owned by the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _LOOP_CLIENTS.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            http2=True,
+            headers={'Accept': 'application/json', 'Content-Type': 'application/json'},
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            timeout=15.0
+        )
+        _LOOP_CLIENTS[loop] = client
+    return client
+
+# Synchronous entry points (the *_batch helpers) run their coroutines on
+# one persistent background loop rather than asyncio.run: a fresh loop
+# per call would close each batch's keep-alive connections on exit and
+# invalidate loop-bound primitives, so nothing would ever be reused.
+_BACKGROUND_LOOP = None
+_BACKGROUND_LOOP_LOCK = threading.Lock()
+
+def run_async(coro):
+    """Run a coroutine on the persistent background loop and return its result."""
+    global _BACKGROUND_LOOP
+    with _BACKGROUND_LOOP_LOCK:
+        if _BACKGROUND_LOOP is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever,
+                             name='bria-async-loop', daemon=True).start()
+            _BACKGROUND_LOOP = loop
+    return asyncio.run_coroutine_threadsafe(coro, _BACKGROUND_LOOP).result()
+
+# asyncio primitives bind to the loop of their first waiter, so the
+# bulkhead semaphores are also created per loop (and per endpoint name).
+_LOOP_SEMAPHORES = weakref.WeakKeyDictionary()
+
+def loop_semaphore(name: str, limit: int) -> asyncio.Semaphore:
+    """Return the named bulkhead semaphore owned by the running loop."""
+    loop = asyncio.get_running_loop()
+    semaphores = _LOOP_SEMAPHORES.get(loop)
+    if semaphores is None:
+        semaphores = {}
+        _LOOP_SEMAPHORES[loop] = semaphores
+    sem = semaphores.get(name)
+    if sem is None:
+        sem = asyncio.Semaphore(limit)
+        semaphores[name] = sem
+    return sem
+
+@lru_cache(maxsize=4)
+def auth_headers(api_key: str):
+    """
+    Per-call headers for a given API key.
+
+    The static headers (Accept, Content-Type, Accept-Encoding) live on
+    the session and async client, so only the auth varies per call; the
+    small lru_cache avoids rebuilding even that dict for repeat keys.
+    """
+    return {'api_token': api_key}
+
+def post_json(url, *, headers, payload, timeout=None):
+    """
+    POST a JSON payload through the shared session.
+
+    The payload is serialized once with orjson and sent as raw bytes, so
+    the (potentially multi-megabyte) body is encoded faster than with the
+    stdlib json module and adapter-level retries resend the same
+    immutable bytes instead of re-serializing.
+    """
+    body = orjson.dumps(payload)
+    return _SESSION.post(url, headers=headers, data=body, timeout=timeout)
+
+async def post_json_async(url, *, headers, payload, timeout=None):
+    """
+    Async counterpart of post_json over the shared httpx client.
+
+    Accepts the same (connect, read) timeout tuples as post_json and
+    translates them to an httpx.Timeout.
+    """
+    body = orjson.dumps(payload)
+    client = _async_client()
+    if timeout is None:
+        return await client.post(url, headers=headers, content=body)
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        timeout = httpx.Timeout(read, connect=connect)
+    return await client.post(url, headers=headers, content=body, timeout=timeout)
+
+def post_multipart(url, *, headers, image_data, fields, timeout=None):
+    """
+    POST an image as a binary multipart part with other parameters as
+    form fields.
+
+    Avoids base64's 4/3 size inflation on the upload path. Content-Type
+    is left to requests so it can set the multipart boundary; non-string
+    field values are JSON-encoded.
+    """
+    # A None value suppresses the session-level JSON Content-Type so
+    # requests can set the multipart boundary.
+    headers = {**headers, 'Content-Type': None}
+    files = {'file': ('image', image_data, 'application/octet-stream')}
+    form = {
+        k: v if isinstance(v, str) else orjson.dumps(v).decode('ascii')
+        for k, v in fields.items()
+    }
+    return _SESSION.post(url, headers=headers, files=files, data=form, timeout=timeout)
+
+def download_result(url: str, dest: str = None) -> Path:
+    """
+    Stream a generated result URL to disk and return the file path.
+
+    Unlike response.content, which buffers the whole image in memory,
+    this writes 64KB chunks as they arrive, keeping peak memory flat for
+    large results.
+
+    Args:
+        url: Result URL returned by a generation endpoint
+        dest: Target file path; a temp file is created when omitted
+    """
+    if dest is None:
+        suffix = Path(urlsplit(url).path).suffix or '.png'
+        fd, dest = tempfile.mkstemp(suffix=suffix)
+        os.close(fd)
+    dest = Path(dest)
+
+    with _SESSION.get(url, stream=True, timeout=(CONNECT_TIMEOUT, 60.0)) as response:
+        response.raise_for_status()
+        with dest.open('wb') as f:
+            for chunk in response.iter_content(1 << 16):
+                f.write(chunk)
+
+    return dest
+
+def prewarm():
+    """
+    Open a connection to the Bria API ahead of the first real call.
+
+    Even with pooling, the first request per process pays the TCP + TLS
+    handshake; firing a cheap HEAD at startup means the first
+    user-visible call hits an already-warm socket. Best-effort: any
+    failure is ignored and the real call will connect normally.
+    """
+    try:
+        _SESSION.head("https://engine.prod.bria-api.com/", timeout=2)
+    except Exception:
+        pass
+
+def _mask_key(api_key: str) -> str:
+    """Shorten an API key so it can appear in logs without leaking."""
+    if not api_key:
+        return '<missing>'
+    if len(api_key) <= 8:
+        return '***'
+    return f"{api_key[:4]}...{api_key[-4:]}"
+
+@lru_cache(maxsize=16)
+def encode_image(image_data: bytes) -> str:
+    """
+    Base64-encode image bytes, memoized across calls.
+
+    Streamlit reruns and multi-service workflows repeatedly submit the
+    same upload; memoizing avoids re-encoding (and re-allocating) a
+    multi-megabyte string each time. The small maxsize bounds how many
+    images are kept alive by the cache.
+    """
+    return base64.b64encode(image_data).decode('ascii')
+
+def close_session():
+    """Close the shared session and its pooled connections."""
+    _SESSION.close()
+
+async def close_async_client():
+    """Close the async client owned by the running loop, if any."""
+    client = _LOOP_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+__all__ = ['close_session', 'close_async_client', 'download_result', 'prewarm']
@@ -1,57 +1,105 @@
-from typing import Dict, Any, Optional
-import requests
-import base64
+from typing import Dict, Any, Optional, Tuple
 
-def erase_foreground(
+import httpx
+import orjson
+
+from ._bria import BriaConfig, _CLIENT
+from ._http import (
+    _BRIA_BREAKER,
+    CONNECT_TIMEOUT,
+    auth_headers,
+    encode_image,
+    loop_semaphore,
+    post_json_async,
+)
+
+# Erase results are deterministic for a given image, so cached responses
+# stay fresh for a while before a background revalidation kicks in.
+_CONFIG = BriaConfig(
+    name="erase_foreground",
+    read_timeout=20.0,
+    max_concurrency=6,
+    ttl_fresh=30 * 60,
+    ttl_stale=5 * 60
+)
+
+URL = "https://engine.prod.bria-api.com/v1/erase_foreground"
+
+def _build_request(
     api_key: str,
     image_data: bytes = None,
     image_url: str = None,
     content_moderation: bool = False
-) -> Dict[str, Any]:
-    """
-    Erase the foreground from an image and generate the area behind it.
-    
-    Args:
-        api_key: Bria AI API key
-        image_data: Image data in bytes (optional if image_url provided)
-        image_url: URL of the image (optional if image_data provided)
-        content_moderation: Whether to enable content moderation
-    """
-    url = "https://engine.prod.bria-api.com/v1/erase_foreground"
-    
-    headers = {
-        'api_token': api_key,
-        'Accept': 'application/json',
-        'Content-Type': 'application/json'
-    }
-    
+) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    """Build the url, headers and payload shared by the sync and async paths."""
+    headers = auth_headers(api_key)
+
     # Prepare request data
     data = {
         'content_moderation': content_moderation
     }
-    
+
     # Add image data
     if image_url:
         data['image_url'] = image_url
     elif image_data:
-        data['file'] = base64.b64encode(image_data).decode('utf-8')
+        data['file'] = encode_image(image_data)
     else:
         raise ValueError("Either image_data or image_url must be provided")
-    
+
+    return URL, headers, data
+
+@_BRIA_BREAKER
+def erase_foreground(
+    api_key: str,
+    image_data: bytes = None,
+    image_url: str = None,
+    content_moderation: bool = False
+) -> Dict[str, Any]:
+    """
+    Erase the foreground from an image and generate the area behind it.
+
+    Args:
+        api_key: Bria AI API key
+        image_data: Image data in bytes (optional if image_url provided)
+        image_url: URL of the image (optional if image_data provided)
+        content_moderation: Whether to enable content moderation
+    """
+    url, headers, data = _build_request(api_key, image_data, image_url, content_moderation)
+
+    # Content moderation can reject previously accepted images, so only
+    # unmoderated (idempotent) requests go through the cache.
+    return _CLIENT.post(
+        url, data,
+        headers=headers,
+        config=_CONFIG,
+        cacheable=not content_moderation,
+        image_data=image_data,
+        error_label="Erase foreground"
+    )
+
+async def erase_foreground_async(
+    api_key: str,
+    image_data: bytes = None,
+    image_url: str = None,
+    content_moderation: bool = False
+) -> Dict[str, Any]:
+    """
+    Async variant of erase_foreground, for batching with asyncio.gather.
+    """
+    url, headers, data = _build_request(api_key, image_data, image_url, content_moderation)
+
     try:
-        print(f"Making request to: {url}")
-        print(f"Headers: {headers}")
-        print(f"Data: {data}")
-        
-        response = requests.post(url, headers=headers, json=data)
+        async with loop_semaphore(_CONFIG.name, _CONFIG.max_concurrency):
+            response = await post_json_async(url, headers=headers, payload=data,
+                                             timeout=(CONNECT_TIMEOUT, _CONFIG.read_timeout))
         response.raise_for_status()
-        
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text}")
-        
-        return response.json()
+        return orjson.loads(response.content)
+    except httpx.HTTPStatusError as http_err:
+        body = http_err.response.content[:2048]
+        raise Exception(f"Erase foreground failed: {http_err} body={body!r}")
     except Exception as e:
         raise Exception(f"Erase foreground failed: {str(e)}")
 
-# Export the function
-__all__ = ['erase_foreground'] 
\ No newline at end of file
+# Export the functions
+__all__ = ['erase_foreground', 'erase_foreground_async']
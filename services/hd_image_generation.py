@@ -1,8 +1,33 @@
-from typing import Dict, Any, Optional, Union
-import requests
-import json
+from typing import Dict, Any, Optional, Union, List, Tuple
+import asyncio
 
-def generate_hd_image(
+import httpx
+import orjson
+
+from ._bria import BriaConfig, _CLIENT
+from ._http import (
+    _BRIA_BREAKER,
+    CONNECT_TIMEOUT,
+    auth_headers,
+    loop_semaphore,
+    post_json_async,
+    run_async,
+)
+
+# Generation is only reproducible with a fixed seed, so caching is
+# restricted to seeded requests (see generate_hd_image). Synchronous HD
+# generation can legitimately run long, hence the generous read timeout.
+_CONFIG = BriaConfig(
+    name="generate_hd_image",
+    read_timeout=60.0,
+    max_concurrency=4,
+    ttl_fresh=60 * 60,
+    ttl_stale=5 * 60
+)
+
+URL_TEMPLATE = "https://engine.prod.bria-api.com/v1/text-to-image/hd/{model_version}"
+
+def _build_request(
     prompt: str,
     api_key: str,
     model_version: str = "2.2",
@@ -18,30 +43,12 @@ def generate_hd_image(
     enhance_image: bool = False,
     content_moderation: bool = False,
     ip_signal: bool = False
-) -> Dict[str, Any]:
-    """Generate HD image from prompt using Bria's text-to-image API.
-    
-    Args:
-        prompt: The prompt to generate images from
-        api_key: API key for authentication
-        model_version: Model version to use (default: "2.2")
-        num_results: Number of images to generate (1-4)
-        aspect_ratio: Image aspect ratio ("1:1", "2:3", "3:2", etc.)
-        sync: Whether to wait for results or get URLs immediately
-        seed: Optional seed for reproducible results
-        negative_prompt: Elements to exclude from generation
-        steps_num: Number of refinement iterations (20-50)
-        text_guidance_scale: How closely to follow text (1-10)
-        medium: Generation medium ("photography" or "art")
-        prompt_enhancement: Whether to enhance the prompt
-        enhance_image: Whether to enhance image quality
-        content_moderation: Whether to enable content moderation
-        ip_signal: Whether to flag potential IP content
-    """
-    
+) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    """Build the url, headers and payload shared by the sync and async paths."""
+
     if not prompt:
         raise ValueError("Prompt is required for image generation")
-    
+
     # Build request data with only provided parameters
     data = {
         "prompt": prompt,
@@ -49,7 +56,7 @@ def generate_hd_image(
         "sync": sync,
         "negative_prompt": negative_prompt
     }
-    
+
     # Add optional parameters only if they have valid values
     if aspect_ratio:
         data["aspect_ratio"] = aspect_ratio
@@ -69,25 +76,116 @@ def generate_hd_image(
         data["content_moderation"] = content_moderation
     if ip_signal:
         data["ip_signal"] = ip_signal
-    
-    url = f"https://engine.prod.bria-api.com/v1/text-to-image/hd/{model_version}"
-    headers = {
-        'api_token': api_key,
-        'Accept': 'application/json',
-        'Content-Type': 'application/json'
-    }
-    
+
+    url = URL_TEMPLATE.format(model_version=model_version)
+    headers = auth_headers(api_key)
+
+    return url, headers, data
+
+@_BRIA_BREAKER
+def generate_hd_image(
+    prompt: str,
+    api_key: str,
+    model_version: str = "2.2",
+    num_results: int = 1,
+    aspect_ratio: str = "1:1",
+    sync: bool = True,
+    seed: Optional[int] = None,
+    negative_prompt: str = "",
+    steps_num: Optional[int] = None,
+    text_guidance_scale: Optional[float] = None,
+    medium: Optional[str] = None,
+    prompt_enhancement: bool = False,
+    enhance_image: bool = False,
+    content_moderation: bool = False,
+    ip_signal: bool = False
+) -> Dict[str, Any]:
+    """Generate HD image from prompt using Bria's text-to-image API.
+
+    Args:
+        prompt: The prompt to generate images from
+        api_key: API key for authentication
+        model_version: Model version to use (default: "2.2")
+        num_results: Number of images to generate (1-4)
+        aspect_ratio: Image aspect ratio ("1:1", "2:3", "3:2", etc.)
+        sync: Whether to wait for results or get URLs immediately
+        seed: Optional seed for reproducible results
+        negative_prompt: Elements to exclude from generation
+        steps_num: Number of refinement iterations (20-50)
+        text_guidance_scale: How closely to follow text (1-10)
+        medium: Generation medium ("photography" or "art")
+        prompt_enhancement: Whether to enhance the prompt
+        enhance_image: Whether to enhance image quality
+        content_moderation: Whether to enable content moderation
+        ip_signal: Whether to flag potential IP content
+    """
+    url, headers, data = _build_request(
+        prompt, api_key, model_version, num_results, aspect_ratio, sync,
+        seed, negative_prompt, steps_num, text_guidance_scale, medium,
+        prompt_enhancement, enhance_image, content_moderation, ip_signal
+    )
+
+    # Unseeded generations are intentionally non-deterministic, and
+    # moderation can change verdicts, so only seeded unmoderated
+    # requests go through the cache.
+    return _CLIENT.post(
+        url, data,
+        headers=headers,
+        config=_CONFIG,
+        cacheable=seed is not None and not content_moderation,
+        error_label="HD image generation"
+    )
+
+async def generate_hd_image_async(
+    prompt: str,
+    api_key: str,
+    model_version: str = "2.2",
+    num_results: int = 1,
+    aspect_ratio: str = "1:1",
+    sync: bool = True,
+    seed: Optional[int] = None,
+    negative_prompt: str = "",
+    steps_num: Optional[int] = None,
+    text_guidance_scale: Optional[float] = None,
+    medium: Optional[str] = None,
+    prompt_enhancement: bool = False,
+    enhance_image: bool = False,
+    content_moderation: bool = False,
+    ip_signal: bool = False
+) -> Dict[str, Any]:
+    """
+    Async variant of generate_hd_image, for batching with asyncio.gather.
+    """
+    url, headers, data = _build_request(
+        prompt, api_key, model_version, num_results, aspect_ratio, sync,
+        seed, negative_prompt, steps_num, text_guidance_scale, medium,
+        prompt_enhancement, enhance_image, content_moderation, ip_signal
+    )
+
     try:
-        print(f"Making request to: {url}")
-        print(f"Headers: {headers}")
-        
-        response = requests.post(url, headers=headers, json=data)
+        async with loop_semaphore(_CONFIG.name, _CONFIG.max_concurrency):
+            response = await post_json_async(url, headers=headers, payload=data,
+                                             timeout=(CONNECT_TIMEOUT, _CONFIG.read_timeout))
         response.raise_for_status()
-        
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text}")
-        
-        return response.json()
-        
+        return orjson.loads(response.content)
+    except httpx.HTTPStatusError as http_err:
+        body = http_err.response.content[:2048]
+        raise Exception(f"HD image generation failed: {http_err} body={body!r}")
     except Exception as e:
-        raise Exception(f"HD image generation failed: {str(e)}") 
\ No newline at end of file
+        raise Exception(f"HD image generation failed: {str(e)}")
+
+def generate_hd_image_batch(prompts: List[str], api_key: str, **kwargs) -> List[Dict[str, Any]]:
+    """
+    Generate images for several prompts concurrently over the shared async client.
+
+    Args:
+        prompts: Prompts to generate, one request each
+        api_key: API key for authentication
+        **kwargs: Forwarded to generate_hd_image_async
+    """
+    async def _gather():
+        return await asyncio.gather(*[
+            generate_hd_image_async(prompt, api_key, **kwargs) for prompt in prompts
+        ])
+
+    return run_async(_gather())
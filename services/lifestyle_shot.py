@@ -1,8 +1,34 @@
-from typing import Dict, Any, Optional, List
-import requests
-import base64
+from typing import Dict, Any, Optional, List, Tuple
+import asyncio
 
-def lifestyle_shot_by_text(
+import httpx
+import orjson
+
+from ._bria import BriaConfig, _CLIENT
+from ._http import (
+    _BRIA_BREAKER,
+    CONNECT_TIMEOUT,
+    auth_headers,
+    encode_image,
+    loop_semaphore,
+    post_json_async,
+    run_async,
+)
+
+# Lifestyle shots are not seeded, so keep the fresh window short: a
+# cache hit here mostly absorbs Streamlit rerun churn.
+_CONFIG = BriaConfig(
+    name="lifestyle_shot",
+    read_timeout=45.0,
+    max_concurrency=4,
+    ttl_fresh=10 * 60,
+    ttl_stale=5 * 60
+)
+
+TEXT_URL = "https://engine.prod.bria-api.com/v1/product/lifestyle_shot_by_text"
+IMAGE_URL = "https://engine.prod.bria-api.com/v1/product/lifestyle_shot_by_image"
+
+def _build_text_request(
     api_key: str,
     image_data: bytes,
     scene_description: str,
@@ -21,41 +47,13 @@ def lifestyle_shot_by_text(
     force_rmbg: bool = False,
     content_moderation: bool = False,
     sku: Optional[str] = None
-) -> Dict[str, Any]:
-    """
-    Generate a lifestyle shot using text description.
-    
-    Args:
-        api_key: Bria AI API key
-        image_data: Image data in bytes
-        scene_description: Text description of the new scene
-        placement_type: How to position the product ("original", "automatic", "manual_placement", "manual_padding", "custom_coordinates")
-        num_results: Number of results to generate
-        sync: Whether to wait for results
-        fast: Whether to use fast mode
-        optimize_description: Whether to optimize the scene description
-        original_quality: Whether to maintain original image quality
-        exclude_elements: Elements to exclude from generation
-        shot_size: Size of the output image [width, height]
-        manual_placement_selection: List of placement positions
-        padding_values: Padding values [left, right, top, bottom]
-        foreground_image_size: Size of foreground image [width, height]
-        foreground_image_location: Position of foreground image [x, y]
-        force_rmbg: Whether to force background removal
-        content_moderation: Whether to enable content moderation
-        sku: Optional SKU identifier
-    """
-    url = "https://engine.prod.bria-api.com/v1/product/lifestyle_shot_by_text"
-    
-    headers = {
-        'api_token': api_key,
-        'Accept': 'application/json',
-        'Content-Type': 'application/json'
-    }
-    
-    # Convert image to base64
-    image_base64 = base64.b64encode(image_data).decode('utf-8')
-    
+) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    """Build the url, headers and payload shared by the sync and async paths."""
+    headers = auth_headers(api_key)
+
+    # Convert image to base64 (memoized across calls)
+    image_base64 = encode_image(image_data)
+
     # Prepare request data
     data = {
         'file': image_base64,
@@ -69,44 +67,164 @@ def lifestyle_shot_by_text(
         'force_rmbg': force_rmbg,
         'content_moderation': content_moderation
     }
-    
+
     # Add optional parameters
     if exclude_elements and not fast:
         data['exclude_elements'] = exclude_elements
-    
+
     if placement_type in ['automatic', 'manual_placement', 'custom_coordinates']:
         data['shot_size'] = shot_size
-    
+
     if placement_type == 'manual_placement':
         data['manual_placement_selection'] = manual_placement_selection
-    
+
     if placement_type == 'manual_padding':
         data['padding_values'] = padding_values
-    
+
     if placement_type == 'custom_coordinates':
         if foreground_image_size:
             data['foreground_image_size'] = foreground_image_size
         if foreground_image_location:
             data['foreground_image_location'] = foreground_image_location
-    
+
     if sku:
         data['sku'] = sku
-    
+
+    return TEXT_URL, headers, data
+
+@_BRIA_BREAKER
+def lifestyle_shot_by_text(
+    api_key: str,
+    image_data: bytes,
+    scene_description: str,
+    placement_type: str = "original",
+    num_results: int = 4,
+    sync: bool = False,
+    fast: bool = True,
+    optimize_description: bool = True,
+    original_quality: bool = False,
+    exclude_elements: Optional[str] = None,
+    shot_size: List[int] = [1000, 1000],
+    manual_placement_selection: List[str] = ["upper_left"],
+    padding_values: List[int] = [0, 0, 0, 0],
+    foreground_image_size: Optional[List[int]] = None,
+    foreground_image_location: Optional[List[int]] = None,
+    force_rmbg: bool = False,
+    content_moderation: bool = False,
+    sku: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Generate a lifestyle shot using text description.
+
+    Args:
+        api_key: Bria AI API key
+        image_data: Image data in bytes
+        scene_description: Text description of the new scene
+        placement_type: How to position the product ("original", "automatic", "manual_placement", "manual_padding", "custom_coordinates")
+        num_results: Number of results to generate
+        sync: Whether to wait for results
+        fast: Whether to use fast mode
+        optimize_description: Whether to optimize the scene description
+        original_quality: Whether to maintain original image quality
+        exclude_elements: Elements to exclude from generation
+        shot_size: Size of the output image [width, height]
+        manual_placement_selection: List of placement positions
+        padding_values: Padding values [left, right, top, bottom]
+        foreground_image_size: Size of foreground image [width, height]
+        foreground_image_location: Position of foreground image [x, y]
+        force_rmbg: Whether to force background removal
+        content_moderation: Whether to enable content moderation
+        sku: Optional SKU identifier
+    """
+    url, headers, data = _build_text_request(
+        api_key, image_data, scene_description, placement_type, num_results,
+        sync, fast, optimize_description, original_quality, exclude_elements,
+        shot_size, manual_placement_selection, padding_values,
+        foreground_image_size, foreground_image_location, force_rmbg,
+        content_moderation, sku
+    )
+
+    # Content moderation can reject previously accepted images, so only
+    # unmoderated (idempotent) requests go through the cache.
+    return _CLIENT.post(
+        url, data,
+        headers=headers,
+        config=_CONFIG,
+        cacheable=not content_moderation,
+        image_data=image_data,
+        error_label="Lifestyle shot generation"
+    )
+
+async def lifestyle_shot_by_text_async(
+    api_key: str,
+    image_data: bytes,
+    scene_description: str,
+    placement_type: str = "original",
+    num_results: int = 4,
+    sync: bool = False,
+    fast: bool = True,
+    optimize_description: bool = True,
+    original_quality: bool = False,
+    exclude_elements: Optional[str] = None,
+    shot_size: List[int] = [1000, 1000],
+    manual_placement_selection: List[str] = ["upper_left"],
+    padding_values: List[int] = [0, 0, 0, 0],
+    foreground_image_size: Optional[List[int]] = None,
+    foreground_image_location: Optional[List[int]] = None,
+    force_rmbg: bool = False,
+    content_moderation: bool = False,
+    sku: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Async variant of lifestyle_shot_by_text, for batching with asyncio.gather.
+    """
+    url, headers, data = _build_text_request(
+        api_key, image_data, scene_description, placement_type, num_results,
+        sync, fast, optimize_description, original_quality, exclude_elements,
+        shot_size, manual_placement_selection, padding_values,
+        foreground_image_size, foreground_image_location, force_rmbg,
+        content_moderation, sku
+    )
+
     try:
-        print(f"Making request to: {url}")
-        print(f"Headers: {headers}")
-        print(f"Data: {data}")
-        
-        response = requests.post(url, headers=headers, json=data)
+        async with loop_semaphore(_CONFIG.name, _CONFIG.max_concurrency):
+            response = await post_json_async(url, headers=headers, payload=data,
+                                             timeout=(CONNECT_TIMEOUT, _CONFIG.read_timeout))
         response.raise_for_status()
-        
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text}")
-        
-        return response.json()
+        return orjson.loads(response.content)
+    except httpx.HTTPStatusError as http_err:
+        body = http_err.response.content[:2048]
+        raise Exception(f"Lifestyle shot generation failed: {http_err} body={body!r}")
     except Exception as e:
         raise Exception(f"Lifestyle shot generation failed: {str(e)}")
 
+def lifestyle_shot_batch(
+    api_key: str,
+    image_data: bytes,
+    scenes: List[str],
+    **kwargs
+) -> List[Dict[str, Any]]:
+    """
+    Generate lifestyle shots for several scene descriptions concurrently.
+
+    The product image is base64-encoded once (encode_image memoizes it)
+    and shared across all variants, so the encoding cost is amortized
+    over the batch while asyncio.gather overlaps the API round trips.
+
+    Args:
+        api_key: Bria AI API key
+        image_data: Image data in bytes
+        scenes: Scene descriptions, one request each
+        **kwargs: Forwarded to lifestyle_shot_by_text_async
+    """
+    async def _gather():
+        return await asyncio.gather(*[
+            lifestyle_shot_by_text_async(api_key, image_data, scene, **kwargs)
+            for scene in scenes
+        ])
+
+    return run_async(_gather())
+
 def lifestyle_shot_by_image(
     api_key: str,
     image_data: bytes,
@@ -129,18 +247,14 @@ def lifestyle_shot_by_image(
     """
     Generate a lifestyle shot using a reference image.
     """
-    url = "https://engine.prod.bria-api.com/v1/product/lifestyle_shot_by_image"
-    
-    headers = {
-        'api_token': api_key,
-        'Accept': 'application/json',
-        'Content-Type': 'application/json'
-    }
-    
-    # Convert images to base64
-    image_base64 = base64.b64encode(image_data).decode('utf-8')
-    reference_base64 = base64.b64encode(reference_image).decode('utf-8')
-    
+    url = IMAGE_URL
+
+    headers = auth_headers(api_key)
+
+    # Convert images to base64 (memoized across calls)
+    image_base64 = encode_image(image_data)
+    reference_base64 = encode_image(reference_image)
+
     # Prepare request data
     data = {
         'file': image_base64,
@@ -154,37 +268,32 @@ def lifestyle_shot_by_image(
         'enhance_ref_image': enhance_ref_image,
         'ref_image_influence': ref_image_influence
     }
-    
+
     # Add optional parameters
     if placement_type in ['automatic', 'manual_placement', 'custom_coordinates']:
         data['shot_size'] = shot_size
-    
+
     if placement_type == 'manual_placement':
         data['manual_placement_selection'] = manual_placement_selection
-    
+
     if placement_type == 'manual_padding':
         data['padding_values'] = padding_values
-    
+
     if placement_type == 'custom_coordinates':
         if foreground_image_size:
             data['foreground_image_size'] = foreground_image_size
         if foreground_image_location:
             data['foreground_image_location'] = foreground_image_location
-    
+
     if sku:
         data['sku'] = sku
-    
-    try:
-        print(f"Making request to: {url}")
-        print(f"Headers: {headers}")
-        print(f"Data: {data}")
-        
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        
-        print(f"Response status: {response.status_code}")
-        print(f"Response body: {response.text}")
-        
-        return response.json()
-    except Exception as e:
-        raise Exception(f"Lifestyle shot generation failed: {str(e)}") 
\ No newline at end of file
+
+    # Two images go in the payload, so this stays on the JSON path and
+    # skips the cache (results are not reproducible without a seed).
+    return _CLIENT.post(
+        url, data,
+        headers=headers,
+        config=_CONFIG,
+        cacheable=False,
+        error_label="Lifestyle shot generation"
+    )
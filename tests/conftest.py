@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Make the repo root importable so `import services` works without an install.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
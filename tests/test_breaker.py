@@ -0,0 +1,86 @@
+import threading
+import time
+
+import pytest
+
+_cache = pytest.importorskip("services._cache")
+_http = pytest.importorskip("services._http")
+
+def test_concurrent_calls_overlap():
+    """The breaker must not serialize calls: four 0.1s calls run in
+    well under 0.4s when fired from four threads."""
+    breaker = _http._CircuitBreaker(fail_max=5, reset_timeout=30)
+
+    @breaker
+    def slow_call():
+        time.sleep(0.1)
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=slow_call) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert time.monotonic() - start < 0.3
+
+def test_opens_after_failures_and_recovers():
+    breaker = _http._CircuitBreaker(fail_max=2, reset_timeout=0.1)
+    calls = []
+
+    @breaker
+    def flaky(fail):
+        calls.append(fail)
+        if fail:
+            raise RuntimeError("boom")
+        return "ok"
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            flaky(True)
+
+    # Open: fails fast without invoking the function.
+    with pytest.raises(_http.CircuitBreakerError):
+        flaky(False)
+    assert len(calls) == 2
+
+    # Half-open after the reset timeout: one probe closes it again.
+    time.sleep(0.15)
+    assert flaky(False) == "ok"
+    assert flaky(False) == "ok"
+
+def test_excluded_exceptions_do_not_trip():
+    breaker = _http._CircuitBreaker(fail_max=1, reset_timeout=30, exclude=(ValueError,))
+
+    @breaker
+    def invalid():
+        raise ValueError("bad input")
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            invalid()
+
+def test_single_flight_dedups_concurrent_callers():
+    """With the breaker no longer serializing calls, concurrent
+    identical requests must collapse onto one execution."""
+    started = threading.Barrier(4)
+    calls = []
+
+    def request():
+        calls.append(1)
+        time.sleep(0.1)
+        return "result"
+
+    results = []
+
+    def caller():
+        started.wait()
+        results.append(_cache.single_flight(("endpoint", "digest"), request))
+
+    threads = [threading.Thread(target=caller) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ["result"] * 4
+    assert len(calls) == 1
@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+
+_http = pytest.importorskip("services._http")
+lifestyle_shot = pytest.importorskip("services.lifestyle_shot")
+
+class _FakeResponse:
+    content = b'{"result": "ok"}'
+
+    def raise_for_status(self):
+        pass
+
+class _FakeClient:
+    async def post(self, url, **kwargs):
+        # Yield control so concurrent requests actually queue on the
+        # bulkhead semaphore.
+        await asyncio.sleep(0)
+        return _FakeResponse()
+
+def test_consecutive_batches_reuse_loop_state(monkeypatch):
+    """
+    Two consecutive 6-scene batches must both succeed in one process.
+
+    Regression check for loop affinity: with more scenes than the
+    endpoint's concurrency bound, the bulkhead semaphore gains waiters
+    and the httpx client opens pooled connections. Both used to bind to
+    the first batch's event loop, making every later batch raise.
+    """
+    monkeypatch.setattr(_http.httpx, "AsyncClient", lambda **kwargs: _FakeClient())
+
+    scenes = [f"scene {i}" for i in range(6)]
+    for _ in range(2):
+        results = lifestyle_shot.lifestyle_shot_batch("key", b"img", scenes)
+        assert results == [{"result": "ok"}] * 6